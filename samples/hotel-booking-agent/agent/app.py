@@ -1,21 +1,26 @@
 from __future__ import annotations
 
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
+import json
 import logging
+import time
+from typing import Any
 
 from fastapi import FastAPI, HTTPException, status
+from fastapi.responses import StreamingResponse
 from langchain_core.messages import HumanMessage
 from pydantic import BaseModel
 
-from graph import build_graph
+from graph import build_graph, open_checkpointer
+from tools import aclose_http_client
 
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s %(levelname)s %(name)s: %(message)s",
 )
 
-agent_graph = build_graph()
-
 class ChatRequest(BaseModel):
     message: str
     session_id: str | None = None
@@ -26,18 +31,38 @@ class ChatRequest(BaseModel):
 class ChatResponse(BaseModel):
     message: str
 
-app = FastAPI(title="Hotel Booking Agent")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    async with open_checkpointer() as checkpointer:
+        app.state.agent_graph = build_graph(checkpointer)
+        try:
+            yield
+        finally:
+            await aclose_http_client()
+
+
+app = FastAPI(title="Hotel Booking Agent", lifespan=lifespan)
+
+_USER_MESSAGE_TEMPLATE = (
+    "User ID: %s\n"
+    "User Name: %s\n"
+    "User Context (non-hotel identifiers): %s (%s)\n"
+    "UTC Time now:\n%s\n\n"
+    "User Query:\n%s"
+)
+
 
 def _wrap_user_message(user_message: str, user_id: str, user_name: str | None) -> str:
-    now = datetime.now(timezone.utc).isoformat()
-    resolved_user_id = user_id
+    now = datetime.fromtimestamp(time.time(), timezone.utc).isoformat(timespec="seconds")
     resolved_user_name = user_name or "Traveler"
-    return (
-        f"User ID: {resolved_user_id}\n"
-        f"User Name: {resolved_user_name}\n"
-        f"User Context (non-hotel identifiers): {resolved_user_name} ({resolved_user_id})\n"
-        f"UTC Time now:\n{now}\n\n"
-        f"User Query:\n{user_message}"
+    return _USER_MESSAGE_TEMPLATE % (
+        user_id,
+        resolved_user_name,
+        resolved_user_name,
+        user_id,
+        now,
+        user_message,
     )
 
 
@@ -51,30 +76,37 @@ def _extract_user_from_payload(request: ChatRequest) -> tuple[str, str | None]:
     return user_id, request.user_name
 
 
-@app.post("/chat", response_model=ChatResponse)
-def chat(request: ChatRequest) -> ChatResponse:
-    session_id = request.session_id
+def _build_graph_run(request: ChatRequest) -> tuple[dict[str, Any], dict[str, Any]]:
     user_id, user_name = _extract_user_from_payload(request)
     wrapped_message = _wrap_user_message(
         request.message,
         user_id,
         user_name,
     )
-    resolved_session_id = session_id or "default"
+    resolved_session_id = request.session_id or "default"
     thread_id = f"{user_id}:{resolved_session_id}"
+    inputs = {"messages": [HumanMessage(content=wrapped_message)]}
+    config = {
+        "recursion_limit": 50,
+        "configurable": {
+            "thread_id": thread_id,
+            "user_id": user_id,
+            "user_query": request.message,
+        },
+    }
+    return inputs, config
+
+
+@app.post("/chat", response_model=ChatResponse)
+async def chat(request: ChatRequest) -> ChatResponse:
+    inputs, config = _build_graph_run(request)
     try:
-        result = agent_graph.invoke(
-            {"messages": [HumanMessage(content=wrapped_message)]},
-            config={
-                "recursion_limit": 50,
-                "configurable": {"thread_id": thread_id},
-            },
-        )
+        result = await app.state.agent_graph.ainvoke(inputs, config=config)
     except Exception:
         logging.exception(
             "chat invoke failed: thread_id=%s session_id=%s",
-            thread_id,
-            session_id,
+            config["configurable"]["thread_id"],
+            request.session_id,
         )
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -87,3 +119,47 @@ def chat(request: ChatRequest) -> ChatResponse:
 
     last_message = messages[-1]
     return ChatResponse(message=last_message.content)
+
+
+def _sse(payload: dict[str, Any], event: str | None = None) -> str:
+    data = json.dumps(payload)
+    return f"event: {event}\ndata: {data}\n\n" if event else f"data: {data}\n\n"
+
+
+async def _stream_chat_events(inputs: dict[str, Any], config: dict[str, Any]) -> AsyncIterator[str]:
+    streamed = False
+    try:
+        async for event in app.state.agent_graph.astream_events(inputs, config=config, version="v2"):
+            kind = event["event"]
+            if kind == "on_chain_start" and event["name"] == "agent":
+                streamed = False
+            elif kind == "on_chat_model_stream":
+                content = event["data"]["chunk"].content
+                if isinstance(content, str) and content:
+                    streamed = True
+                    yield _sse({"delta": content})
+            elif kind == "on_chain_end" and event["name"] == "agent" and not streamed:
+                # Answers served from the semantic cache skip the model, so they arrive whole.
+                output = event["data"].get("output") or {}
+                for message in output.get("messages", []) if isinstance(output, dict) else []:
+                    content = getattr(message, "content", None)
+                    if isinstance(content, str) and content and not getattr(message, "tool_calls", None):
+                        yield _sse({"delta": content})
+    except Exception:
+        logging.exception(
+            "chat stream failed: thread_id=%s",
+            config["configurable"]["thread_id"],
+        )
+        yield _sse({"error": "Internal server error"}, event="error")
+        return
+    yield _sse({}, event="done")
+
+
+@app.post("/chat/stream")
+async def chat_stream(request: ChatRequest) -> StreamingResponse:
+    inputs, config = _build_graph_run(request)
+    return StreamingResponse(
+        _stream_chat_events(inputs, config),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
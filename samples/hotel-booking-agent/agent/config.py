@@ -24,6 +24,25 @@ class Settings(BaseSettings):
         description="Base URL for the hotel booking API.",
         validation_alias="HOTEL_API_BASE_URL",
     )
+    redis_url: str | None = Field(
+        default=None,
+        description=(
+            "Redis URL for conversation checkpoints (needs RedisJSON and RediSearch); "
+            "kept in process memory when unset."
+        ),
+    )
+    semantic_cache_enabled: bool = Field(
+        default=False,
+        description="Reuse answers to near-identical opening questions that needed no tools.",
+    )
+    semantic_cache_threshold: float = Field(
+        default=0.95,
+        description="Minimum cosine similarity for a semantic cache hit.",
+    )
+    semantic_cache_ttl_seconds: float = Field(
+        default=3600.0,
+        description="How long a cached answer can be reused.",
+    )
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
 settings = Settings()
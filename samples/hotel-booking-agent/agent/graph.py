@@ -1,17 +1,25 @@
 from __future__ import annotations
 
+import hashlib
 import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
 from typing import Annotated, TypedDict
 
-from langchain_core.messages import BaseMessage, SystemMessage
-from langchain_openai import ChatOpenAI
+from langchain_core.messages import AIMessage, BaseMessage, SystemMessage
+from langchain_core.runnables import RunnableConfig
+from langchain_openai import ChatOpenAI, OpenAIEmbeddings
 from langgraph.graph import StateGraph
 from langgraph.graph.message import add_messages
 from langgraph.prebuilt import ToolNode, tools_condition
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.checkpoint.memory import InMemorySaver
 
 
 from config import settings
+from embedding_batcher import EmbeddingBatcher
+from semantic_cache import SemanticCache
 from tools import TOOLS
 
 logger = logging.getLogger(__name__)
@@ -27,13 +35,17 @@ Instructions:
 - Use the provided tools to search for hotels and availability, answer policy questions, and place, view, edit, or cancel bookings as needed.
 - Present only information explicitly returned by tool outputs or provided by the user. If something isn't available, say so and offer to look it up.
 """
+# Built once and reused every turn; keeping the prompt byte-identical also lets OpenAI's prompt cache apply.
+_SYSTEM_MSG = SystemMessage(content=SYSTEM_PROMPT)
+# Cached answers are scoped to the prompt that produced them.
+_SYSTEM_PROMPT_VERSION = hashlib.sha256(SYSTEM_PROMPT.encode("utf-8")).hexdigest()[:12]
 
 
 class AgentState(TypedDict):
     messages: Annotated[list[BaseMessage], add_messages]
 
 
-def build_graph():
+def build_graph(checkpointer: BaseCheckpointSaver):
     tools = TOOLS
     llm = ChatOpenAI(
         model=settings.openai_model,
@@ -41,16 +53,52 @@ def build_graph():
         timeout=settings.openai_timeout,
         max_retries=settings.openai_max_retries,
     ).bind_tools(tools)
+    semantic_cache = (
+        SemanticCache(
+            EmbeddingBatcher(
+                OpenAIEmbeddings(
+                    model=settings.openai_embedding_model,
+                    api_key=settings.openai_api_key,
+                )
+            ),
+            threshold=settings.semantic_cache_threshold,
+            ttl_seconds=settings.semantic_cache_ttl_seconds,
+        )
+        if settings.semantic_cache_enabled
+        else None
+    )
 
-    def agent_node(state: AgentState) -> AgentState:
-        messages = [SystemMessage(content=SYSTEM_PROMPT)] + state["messages"]
-        response = llm.invoke(messages)
+    async def agent_node(state: AgentState, config: RunnableConfig) -> AgentState:
+        configurable = config.get("configurable") or {}
+        user_query = configurable.get("user_query")
+        cache_scope = None
+        cache_vector = None
+        # Only a thread's opening question is cached; later turns depend on the conversation so far.
+        if semantic_cache is not None and user_query and len(state["messages"]) == 1:
+            # The prompt carries the current time, so answers are never reused across UTC days.
+            today = datetime.now(timezone.utc).date().isoformat()
+            cache_scope = f"{_SYSTEM_PROMPT_VERSION}:{today}:{configurable.get('user_id', '')}"
+            try:
+                cache_vector = await semantic_cache.embed(user_query)
+            except Exception:
+                logger.exception("semantic cache embedding failed; calling the model")
+            else:
+                cached = semantic_cache.lookup(cache_scope, cache_vector)
+                if cached is not None:
+                    logger.debug("agent_node answered from the semantic cache.")
+                    return {"messages": [AIMessage(content=cached)]}
+
+        messages = [_SYSTEM_MSG, *state["messages"]]
+        response = await llm.ainvoke(messages)
         tool_calls = getattr(response, "tool_calls", None) or []
         if tool_calls:
             tool_names = [call.get("name") for call in tool_calls if isinstance(call, dict)]
             logger.debug("agent_node decided to call tools: %s", tool_names)
         else:
             logger.debug("agent_node returned a final response (no tool calls).")
+            # Answers that needed tools depend on live data, so only tool-free answers are stored.
+            if cache_vector is not None and isinstance(response.content, str) and response.content:
+                semantic_cache.store(cache_scope, cache_vector, response.content)
         return {"messages": [response]}
 
     graph = StateGraph(AgentState) #add in memory server
@@ -62,5 +110,17 @@ def build_graph():
     graph.add_edge("tools", "agent")
     graph.set_entry_point("agent")
 
-    checkpointer = InMemorySaver()
     return graph.compile(checkpointer=checkpointer)
+
+
+@asynccontextmanager
+async def open_checkpointer() -> AsyncIterator[BaseCheckpointSaver]:
+    if not settings.redis_url:
+        yield InMemorySaver()
+        return
+    # Shared across workers, so a thread can continue on any replica.
+    from langgraph.checkpoint.redis.aio import AsyncRedisSaver
+
+    async with AsyncRedisSaver.from_conn_string(settings.redis_url) as checkpointer:
+        await checkpointer.asetup()
+        yield checkpointer
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import logging
+import math
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+
+from langchain_core.embeddings import Embeddings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class _CacheEntry:
+    vector: tuple[float, ...]
+    norm: float
+    answer: str
+    expires_at: float
+
+
+class SemanticCache:
+    """In-process cache of final agent answers, matched by query embedding within a scope."""
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        threshold: float,
+        ttl_seconds: float,
+        max_entries_per_scope: int = 64,
+        max_scopes: int = 1024,
+    ) -> None:
+        self._embeddings = embeddings
+        self._threshold = threshold
+        self._ttl_seconds = ttl_seconds
+        self._max_entries_per_scope = max_entries_per_scope
+        self._max_scopes = max_scopes
+        self._entries: OrderedDict[str, deque[_CacheEntry]] = OrderedDict()
+
+    async def embed(self, text: str) -> list[float]:
+        return await self._embeddings.aembed_query(text)
+
+    def lookup(self, scope: str, vector: list[float]) -> str | None:
+        entries = self._entries.get(scope)
+        if not entries:
+            return None
+        self._entries.move_to_end(scope)
+        now = time.monotonic()
+        # Entries are appended in time order, so expired ones sit at the front.
+        while entries and entries[0].expires_at <= now:
+            entries.popleft()
+        norm = _norm(vector)
+        best_score = 0.0
+        best_answer = None
+        for entry in entries:
+            score = _cosine(vector, norm, entry)
+            if score > best_score:
+                best_score, best_answer = score, entry.answer
+        if best_score < self._threshold:
+            return None
+        logger.debug("semantic cache hit: scope=%s score=%.3f", scope, best_score)
+        return best_answer
+
+    def store(self, scope: str, vector: list[float], answer: str) -> None:
+        entries = self._entries.get(scope)
+        if entries is None:
+            entries = self._entries[scope] = deque(maxlen=self._max_entries_per_scope)
+            while len(self._entries) > self._max_scopes:
+                self._entries.popitem(last=False)
+        else:
+            self._entries.move_to_end(scope)
+        expires_at = time.monotonic() + self._ttl_seconds
+        entries.append(_CacheEntry(tuple(vector), _norm(vector), answer, expires_at))
+
+
+def _norm(vector: list[float] | tuple[float, ...]) -> float:
+    return math.sqrt(math.fsum(v * v for v in vector))
+
+
+def _cosine(vector: list[float], norm: float, entry: _CacheEntry) -> float:
+    if not norm or not entry.norm:
+        return 0.0
+    return math.fsum(a * b for a, b in zip(vector, entry.vector)) / (norm * entry.norm)
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import logging
 from typing import Any, Optional
-import requests
+import httpx
 from datetime import date, datetime, timedelta, timezone
 from langchain_pinecone import PineconeVectorStore
 from pinecone import Pinecone
@@ -14,6 +14,19 @@ from config import settings
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on policy text returned to the LLM, to keep prompt size bounded.
+POLICY_CONTEXT_MAX_CHARS = 8000
+
+# Shared by all tools so hotel and weather API calls reuse pooled keep-alive connections.
+_http_client = httpx.AsyncClient(
+    timeout=30,
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+)
+
+
+async def aclose_http_client() -> None:
+    await _http_client.aclose()
+
 
 class RoomConfiguration(BaseModel):
     room_id: str = Field(..., description="Room ID to book.")
@@ -103,18 +116,27 @@ def _booking_api_url(path: str) -> str:
     return f"{settings.hotel_api_base_url.rstrip('/')}{path}"
 
 
-def _call_hotel_api(
+async def _call_hotel_api(
     method: str,
     path: str,
     *,
     params: dict[str, Any] | None = None,
     json_body: dict[str, Any] | None = None,
+    data: str | None = None,
 ) -> dict[str, Any]:
     url = _booking_api_url(path)
+    headers = {"Content-Type": "application/json"} if data is not None else None
     try:
-        response = requests.request(method, url, params=params, json=json_body, timeout=30)
+        response = await _http_client.request(
+            method,
+            url,
+            params=params,
+            json=json_body,
+            content=data,
+            headers=headers,
+        )
         response.raise_for_status()
-    except requests.RequestException:
+    except httpx.HTTPError:
         logger.exception("Hotel API request failed: %s %s", method, url)
         return {"error": "Hotel API request failed."}
     try:
@@ -126,12 +148,12 @@ def _call_hotel_api(
     return payload
 
 
-def _resolve_hotel_id(hotel_name: Optional[str]) -> Optional[str]:
+async def _resolve_hotel_id(hotel_name: Optional[str]) -> Optional[str]:
     candidate_name = (hotel_name or "").strip()
     if not candidate_name:
         return None
     logger.info("Resolving hotel id from name: %s", candidate_name)
-    resolve_payload = _call_hotel_api(
+    resolve_payload = await _call_hotel_api(
         "GET",
         "/hotels/resolve",
         params={"name": candidate_name},
@@ -143,7 +165,7 @@ def _resolve_hotel_id(hotel_name: Optional[str]) -> Optional[str]:
 
 
 @tool
-def query_hotel_policy_tool(
+async def query_hotel_policy_tool(
     question: str,
     hotel_id: Optional[str] = None,
     hotel_name: Optional[str] = None,
@@ -171,7 +193,7 @@ def query_hotel_policy_tool(
     if clean_id and " " not in clean_id:
         resolved_id = clean_id
     else:
-        resolved_id = _resolve_hotel_id(hotel_name or hotel_id)
+        resolved_id = await _resolve_hotel_id(hotel_name or hotel_id)
     if resolved_id:
         try:
             vectorstore = _policy_vectorstore()
@@ -191,13 +213,22 @@ def query_hotel_policy_tool(
                     "filter": {"hotel_id": {"$eq": resolved_id}},
                 }
             )
-            docs = retriever.get_relevant_documents(question)
+            docs = await retriever.ainvoke(question)
             logger.info("policy search returned %s documents", len(docs))
         except Exception:
             logger.exception("policy search failed for hotel_id=%s", resolved_id)
             docs = []
-        context_chunks = [getattr(d, "page_content", "") for d in docs]
-        context = "\n\n".join([c for c in context_chunks if c])
+        context_chunks: list[str] = []
+        context_size = 0
+        for doc in docs:
+            chunk = getattr(doc, "page_content", "")
+            if not chunk:
+                continue
+            if context_size + len(chunk) > POLICY_CONTEXT_MAX_CHARS:
+                break
+            context_chunks.append(chunk)
+            context_size += len(chunk) + 2
+        context = "\n\n".join(context_chunks)
         if context:
             return {
                 "found": True,
@@ -224,7 +255,7 @@ def query_hotel_policy_tool(
 
 
 @tool
-def search_hotels_tool(
+async def search_hotels_tool(
     check_in_date: Optional[str] = None,
     check_out_date: Optional[str] = None,
     destination: Optional[str] = None,
@@ -278,14 +309,14 @@ def search_hotels_tool(
         "sort_by": sort_by,
     }
     params = {k: v for k, v in params.items() if v is not None}
-    response = _call_hotel_api("GET", "/hotels/search", params=params)
+    response = await _call_hotel_api("GET", "/hotels/search", params=params)
     if isinstance(response, dict) and response.get("error"):
         return response
     return response
 
 
 @tool
-def get_hotel_info_tool(hotel_id: Optional[str] = None, hotel_name: Optional[str] = None) -> dict[str, Any]:
+async def get_hotel_info_tool(hotel_id: Optional[str] = None, hotel_name: Optional[str] = None) -> dict[str, Any]:
     """
     Get details for one hotel by id or name.
 
@@ -303,18 +334,18 @@ def get_hotel_info_tool(hotel_id: Optional[str] = None, hotel_name: Optional[str
     if clean_id and " " not in clean_id:
         resolved_id = clean_id
     else:
-        resolved_id = _resolve_hotel_id(hotel_name or hotel_id)
+        resolved_id = await _resolve_hotel_id(hotel_name or hotel_id)
     if not resolved_id:
         return {"error": "Hotel not found. Provide a valid hotel_id or hotel_name."}
     logger.info("get_hotel_info_tool called: hotel_id=%s", resolved_id)
-    response = _call_hotel_api("GET", f"/hotels/{resolved_id}")
+    response = await _call_hotel_api("GET", f"/hotels/{resolved_id}")
     if isinstance(response, dict) and response.get("error"):
         return response
     return response
 
 
 @tool
-def check_hotel_availability_tool(
+async def check_hotel_availability_tool(
     check_in_date: str,
     check_out_date: str,
     guests: int,
@@ -340,7 +371,7 @@ def check_hotel_availability_tool(
     if clean_id and " " not in clean_id:
         resolved_id = clean_id
     else:
-        resolved_id = _resolve_hotel_id(hotel_name or hotel_id)
+        resolved_id = await _resolve_hotel_id(hotel_name or hotel_id)
     if not resolved_id:
         return {"error": "Hotel not found. Provide a valid hotel_id or hotel_name."}
     logger.info(
@@ -357,7 +388,7 @@ def check_hotel_availability_tool(
         "guests": guests,
         "room_count": room_count,
     }
-    response = _call_hotel_api(
+    response = await _call_hotel_api(
         "GET",
         f"/hotels/{resolved_id}/availability",
         params=params,
@@ -368,7 +399,7 @@ def check_hotel_availability_tool(
 
 
 @tool(args_schema=BookingRequest)
-def create_booking_tool(
+async def create_booking_tool(
     hotel_id: str,
     rooms: list[RoomConfiguration],
     check_in_date: str,
@@ -419,7 +450,7 @@ def create_booking_tool(
         "primary_guest": primary_guest.model_dump(),
         "special_requests": special_requests.model_dump() if special_requests else None,
     }
-    return _call_hotel_api(
+    return await _call_hotel_api(
         "POST",
         "/bookings",
         json_body=payload,
@@ -427,7 +458,7 @@ def create_booking_tool(
 
 
 @tool(args_schema=BookingUpdateRequest)
-def edit_booking_tool(
+async def edit_booking_tool(
     user_id: Optional[str],
     booking_id: str,
     hotel_id: Optional[str] = None,
@@ -465,32 +496,24 @@ def edit_booking_tool(
         user_id,
         hotel_id,
     )
-    payload: dict[str, Any] = {"booking_id": booking_id}
-    if user_id:
-        payload["user_id"] = user_id
-    if hotel_id is not None:
-        payload["hotel_id"] = hotel_id
-    if hotel_name is not None:
-        payload["hotel_name"] = hotel_name
-    if rooms is not None:
-        payload["rooms"] = [room.model_dump() for room in rooms]
-    if check_in_date is not None:
-        payload["check_in_date"] = check_in_date
-    if check_out_date is not None:
-        payload["check_out_date"] = check_out_date
-    if number_of_guests is not None:
-        payload["number_of_guests"] = number_of_guests
-    if number_of_rooms is not None:
-        payload["number_of_rooms"] = number_of_rooms
-    if primary_guest is not None:
-        payload["primary_guest"] = primary_guest.model_dump()
-    if special_requests is not None:
-        payload["special_requests"] = special_requests.model_dump()
-
-    response = _call_hotel_api(
+    request = BookingUpdateRequest(
+        user_id=user_id or None,
+        booking_id=booking_id,
+        hotel_id=hotel_id,
+        hotel_name=hotel_name,
+        rooms=rooms,
+        check_in_date=check_in_date,
+        check_out_date=check_out_date,
+        number_of_guests=number_of_guests,
+        number_of_rooms=number_of_rooms,
+        primary_guest=primary_guest,
+        special_requests=special_requests,
+    )
+
+    response = await _call_hotel_api(
         "PUT",
         f"/bookings/{booking_id}",
-        json_body=payload,
+        data=request.model_dump_json(exclude_none=True),
     )
     if isinstance(response, dict) and response.get("error"):
         return response
@@ -498,7 +521,7 @@ def edit_booking_tool(
 
 
 @tool(args_schema=BookingCancelRequest)
-def cancel_booking_tool(booking_id: str, user_id: Optional[str] = None) -> dict[str, Any]:
+async def cancel_booking_tool(booking_id: str, user_id: Optional[str] = None) -> dict[str, Any]:
     """
     Cancel a booking by booking_id.
 
@@ -511,7 +534,7 @@ def cancel_booking_tool(booking_id: str, user_id: Optional[str] = None) -> dict[
     """
     logger.info("cancel_booking_tool called: booking_id=%s user_id=%s", booking_id, user_id)
     params = {"user_id": user_id} if user_id else None
-    response = _call_hotel_api(
+    response = await _call_hotel_api(
         "DELETE",
         f"/bookings/{booking_id}",
         params=params,
@@ -522,7 +545,7 @@ def cancel_booking_tool(booking_id: str, user_id: Optional[str] = None) -> dict[
 
 
 @tool(args_schema=BookingListRequest)
-def list_bookings_tool(user_id: Optional[str] = None, status: Optional[str] = None) -> dict[str, Any]:
+async def list_bookings_tool(user_id: Optional[str] = None, status: Optional[str] = None) -> dict[str, Any]:
     """
     List bookings for a user, optionally filtered by status.
 
@@ -535,7 +558,7 @@ def list_bookings_tool(user_id: Optional[str] = None, status: Optional[str] = No
     """
     logger.info("list_bookings_tool called: user_id=%s status=%s", user_id, status)
     params = {"user_id": user_id} if user_id else None
-    response = _call_hotel_api(
+    response = await _call_hotel_api(
         "GET",
         "/bookings",
         params=params,
@@ -556,7 +579,7 @@ def list_bookings_tool(user_id: Optional[str] = None, status: Optional[str] = No
 
 
 @tool
-def get_weather_forecast_tool(location: str, date: Optional[str] = None) -> dict[str, Any]:
+async def get_weather_forecast_tool(location: str, date: Optional[str] = None) -> dict[str, Any]:
     """
     Get weather for a location (current or specific date).
 
@@ -578,9 +601,9 @@ def get_weather_forecast_tool(location: str, date: Optional[str] = None) -> dict
         endpoint = f"{base_url}/current.json"
         params = {"key": settings.weather_api_key, "q": location}
     try:
-        response = requests.get(endpoint, params=params, timeout=30)
+        response = await _http_client.get(endpoint, params=params)
         response.raise_for_status()
-    except requests.RequestException:
+    except httpx.HTTPError:
         logger.exception("get_weather_forecast_tool failed calling Weather API")
         return {"error": "Weather API request failed."}
     try:
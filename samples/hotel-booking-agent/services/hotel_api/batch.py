@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any
+
+import httpx
+import orjson
+from fastapi import APIRouter, HTTPException, Request, status
+from pydantic import BaseModel, Field
+
+from errors import error_response
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+MAX_BATCH_SIZE = 20
+# Set on every in-process sub-request so /batch refuses to run nested, however its path is spelled.
+_SUBREQUEST_HEADER = "x-batch-subrequest"
+
+
+class BatchItem(BaseModel):
+    id: str
+    method: str = "GET"
+    url: str
+    body: Any = None
+
+
+class BatchRequest(BaseModel):
+    requests: list[BatchItem] = Field(default_factory=list)
+
+
+def _decode_body(response: httpx.Response) -> Any:
+    if not response.content:
+        return None
+    try:
+        return orjson.loads(response.content)
+    except orjson.JSONDecodeError:
+        return response.text
+
+
+def _is_valid_subrequest_url(url: str) -> bool:
+    if not url.startswith("/") or url.startswith("//"):
+        return False
+    # Resolve dot segments and percent-encoding the way the dispatched request will.
+    path = httpx.URL(f"http://batch{url}").path
+    return path != "/batch" and not path.startswith("/batch/")
+
+
+async def _dispatch(client: httpx.AsyncClient, item: BatchItem) -> dict[str, Any]:
+    content = orjson.dumps(item.body) if item.body is not None else None
+    headers = {_SUBREQUEST_HEADER: "1"}
+    if content is not None:
+        headers["content-type"] = "application/json"
+    response = await client.request(item.method.upper(), item.url, content=content, headers=headers)
+    return {"id": item.id, "status": response.status_code, "body": _decode_body(response)}
+
+
+@router.post("/batch")
+async def batch(payload: BatchRequest, request: Request):
+    if _SUBREQUEST_HEADER in request.headers:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=error_response("Batch requests cannot be nested", "NESTED_BATCH_REQUEST"),
+        )
+    if len(payload.requests) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=error_response(
+                f"At most {MAX_BATCH_SIZE} requests per batch", "BATCH_TOO_LARGE"
+            ),
+        )
+    for item in payload.requests:
+        if not _is_valid_subrequest_url(item.url):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=error_response(
+                    f"Invalid url for batch request '{item.id}'", "INVALID_BATCH_REQUEST"
+                ),
+            )
+
+    # Sub-requests are dispatched in-process through the ASGI app, with no network hop.
+    transport = httpx.ASGITransport(app=request.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://batch") as client:
+        results = await asyncio.gather(
+            *(_dispatch(client, item) for item in payload.requests),
+            return_exceptions=True,
+        )
+
+    responses = []
+    for item, result in zip(payload.requests, results):
+        if isinstance(result, Exception):
+            logger.error("batch: sub-request %s failed", item.id, exc_info=result)
+            result = {
+                "id": item.id,
+                "status": status.HTTP_500_INTERNAL_SERVER_ERROR,
+                "body": error_response("Batch sub-request failed", "BATCH_REQUEST_FAILED"),
+            }
+        responses.append(result)
+    return {"responses": responses}
@@ -1,69 +1,188 @@
 from __future__ import annotations
 
-import json
 import logging
-import uuid
-from datetime import datetime, timezone
+import secrets
+import sqlite3
+import threading
+from collections.abc import Iterator
 from pathlib import Path
 from typing import Any
 
+import ijson
+import orjson
 from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import StreamingResponse
+
+from errors import current_timestamp, error_response
 
 logger = logging.getLogger(__name__)
 
-DATA_PATH = Path(__file__).resolve().parent / "storage" / "bookings.json"
-DATA_PATH.parent.mkdir(parents=True, exist_ok=True)
+DB_PATH = Path(__file__).resolve().parent / "storage" / "bookings.db"
+DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+LEGACY_DATA_PATH = DB_PATH.with_name("bookings.json")
+
+
+def _connect() -> sqlite3.Connection:
+    connection = sqlite3.connect(DB_PATH, check_same_thread=False, isolation_level=None)
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.execute("PRAGMA temp_store=MEMORY")
+    connection.execute("PRAGMA mmap_size=268435456")
+    return connection
+
+
+_db_lock = threading.Lock()
+_db = _connect()
+_db.execute("PRAGMA journal_mode=WAL")
+_db.execute(
+    """
+    CREATE TABLE IF NOT EXISTS bookings (
+        booking_id TEXT PRIMARY KEY,
+        user_id TEXT NOT NULL,
+        booking_status TEXT,
+        data TEXT NOT NULL
+    )
+    """
+)
+_db.execute("CREATE INDEX IF NOT EXISTS ix_bookings_user_id ON bookings(user_id)")
+
+
+def _import_legacy_bookings() -> None:
+    """Stream bookings from the pre-SQLite bookings.json file into the database, once."""
+    # Each uvicorn worker runs this at import; whichever gets here first imports and renames the file.
+    try:
+        legacy_file = LEGACY_DATA_PATH.open("rb")
+    except FileNotFoundError:
+        return
+    imported = 0
+    with _db_lock, legacy_file:
+        _db.execute("BEGIN")
+        try:
+            for booking in ijson.items(legacy_file, "item", use_float=True):
+                if not booking.get("booking_id"):
+                    continue
+                # The old JSON store accepted "user_id": null; such bookings belong to "guest".
+                booking["user_id"] = booking.get("user_id") or "guest"
+                cursor = _db.execute(
+                    "INSERT OR IGNORE INTO bookings (booking_id, user_id, booking_status, data) VALUES (?, ?, ?, ?)",
+                    (
+                        booking["booking_id"],
+                        booking["user_id"],
+                        booking.get("booking_status"),
+                        orjson.dumps(booking).decode(),
+                    ),
+                )
+                imported += cursor.rowcount
+            _db.execute("COMMIT")
+        except Exception:
+            _db.execute("ROLLBACK")
+            logger.exception("failed to import legacy bookings from %s", LEGACY_DATA_PATH)
+            return
+    try:
+        LEGACY_DATA_PATH.rename(LEGACY_DATA_PATH.with_suffix(".json.imported"))
+    except FileNotFoundError:
+        # Another worker finished the same import first; INSERT OR IGNORE kept it idempotent.
+        return
+    logger.info("imported %s legacy bookings from %s", imported, LEGACY_DATA_PATH)
+
+
+_import_legacy_bookings()
 
 router = APIRouter()
 
 
-def _error_response(message: str, code: str) -> dict[str, Any]:
-    return {
-        "message": message,
-        "error_code": code,
-        "timestamp": _get_current_timestamp(),
-    }
+def _generate_booking_id() -> str:
+    return f"BK{secrets.token_hex(4).upper()}"
 
 
-def _get_current_timestamp() -> str:
-    return datetime.now(timezone.utc).isoformat()
+def _generate_confirmation_number() -> str:
+    return f"CONF{secrets.token_hex(8).upper()}"
 
 
-def _generate_booking_id() -> str:
-    return f"BK{uuid.uuid4().hex[:8].upper()}"
+def _insert_booking(booking: dict[str, Any]) -> None:
+    with _db_lock:
+        _db.execute(
+            "INSERT INTO bookings (booking_id, user_id, booking_status, data) VALUES (?, ?, ?, ?)",
+            (
+                booking["booking_id"],
+                booking["user_id"],
+                booking.get("booking_status"),
+                orjson.dumps(booking).decode(),
+            ),
+        )
 
 
-def _generate_confirmation_number() -> str:
-    return f"CONF{uuid.uuid4()}"
+def _fetch_booking(booking_id: str, user_id: str) -> dict[str, Any] | None:
+    with _db_lock:
+        row = _db.execute(
+            "SELECT data FROM bookings WHERE booking_id = ? AND user_id = ?",
+            (booking_id, user_id),
+        ).fetchone()
+    return orjson.loads(row[0]) if row else None
 
 
-def _load_bookings() -> list[dict[str, Any]]:
-    if not DATA_PATH.exists():
-        DATA_PATH.write_text("[]")
-        return []
-    try:
-        return json.loads(DATA_PATH.read_text())
-    except json.JSONDecodeError:
-        logger.warning("booking data corrupted; starting fresh")
-        DATA_PATH.write_text("[]")
-        return []
+_STREAM_BATCH_SIZE = 100
 
 
-def _save_bookings(bookings: list[dict[str, Any]]) -> None:
-    DATA_PATH.write_text(json.dumps(bookings, indent=2))
+def _open_user_bookings_cursor(user_id: str) -> sqlite3.Cursor:
+    # A dedicated connection lets the response stream rows without holding _db_lock;
+    # WAL mode allows it to read alongside the writer connection.
+    reader = _connect()
+    try:
+        return reader.execute("SELECT data FROM bookings WHERE user_id = ?", (user_id,))
+    except Exception:
+        reader.close()
+        raise
 
 
-def _update_booking_record(bookings: list[dict[str, Any]], booking_id: str, updates: dict[str, Any]) -> dict[str, Any] | None:
-    for booking in bookings:
-        if booking.get("booking_id") == booking_id:
+def _stream_json_array(cursor: sqlite3.Cursor) -> Iterator[bytes]:
+    # Rows already hold serialized JSON objects, so they are joined without re-encoding.
+    try:
+        yield b"["
+        separator = b""
+        while rows := cursor.fetchmany(_STREAM_BATCH_SIZE):
+            yield separator + b",".join(row[0].encode() for row in rows)
+            separator = b","
+        yield b"]"
+    finally:
+        cursor.connection.close()
+
+
+def _update_booking_record(
+    booking_id: str, user_id: str, updates: dict[str, Any]
+) -> dict[str, Any] | None:
+    # Read and write back in one IMMEDIATE transaction so a concurrent change, from this
+    # process or another worker, cannot be overwritten by a stale copy of the booking.
+    with _db_lock:
+        _db.execute("BEGIN IMMEDIATE")
+        try:
+            row = _db.execute(
+                "SELECT data FROM bookings WHERE booking_id = ? AND user_id = ?",
+                (booking_id, user_id),
+            ).fetchone()
+            if not row:
+                _db.execute("COMMIT")
+                return None
+            booking = orjson.loads(row[0])
             booking.update(updates)
-            return booking
-    return None
+            _db.execute(
+                "UPDATE bookings SET booking_status = ?, data = ? WHERE booking_id = ? AND user_id = ?",
+                (
+                    booking.get("booking_status"),
+                    orjson.dumps(booking).decode(),
+                    booking_id,
+                    user_id,
+                ),
+            )
+            _db.execute("COMMIT")
+        except Exception:
+            _db.execute("ROLLBACK")
+            raise
+    return booking
 
 
 @router.post("/bookings", status_code=201)
 def create_booking(payload: dict[str, Any]):
-    user_id = payload.get("user_id", "guest")
+    user_id = payload.get("user_id") or "guest"
     pricing: list[dict[str, Any]] = []
 
     booking_id = _generate_booking_id()
@@ -81,15 +200,13 @@ def create_booking(payload: dict[str, Any]):
         "primary_guest": payload.get("primary_guest"),
         "pricing": pricing,
         "booking_status": "CONFIRMED",
-        "booking_date": _get_current_timestamp(),
+        "booking_date": current_timestamp(),
         "confirmation_number": confirmation_number,
         "special_requests": payload.get("special_requests"),
     }
 
     try:
-        bookings = _load_bookings()
-        bookings.append(new_booking)
-        _save_bookings(bookings)
+        _insert_booking(new_booking)
     except Exception:
         logger.exception("create_booking: failed to persist booking")
         raise HTTPException(
@@ -108,32 +225,24 @@ def create_booking(payload: dict[str, Any]):
 @router.get("/bookings")
 def get_bookings(user_id: str):
     try:
-        bookings = _load_bookings()
-        return [booking for booking in bookings if booking.get("user_id") == user_id]
+        cursor = _open_user_bookings_cursor(user_id)
     except Exception:
         logger.exception("get_bookings: failed to fetch bookings")
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail=_error_response("Storage unavailable", "STORAGE_UNAVAILABLE"),
+            detail=error_response("Storage unavailable", "STORAGE_UNAVAILABLE"),
         )
+    return StreamingResponse(_stream_json_array(cursor), media_type="application/json")
 
 
 @router.get("/bookings/{booking_id}")
 def get_booking(booking_id: str, user_id: str):
     try:
-        bookings = _load_bookings()
-        booking = next(
-            (
-                item
-                for item in bookings
-                if item.get("booking_id") == booking_id and item.get("user_id") == user_id
-            ),
-            None,
-        )
+        booking = _fetch_booking(booking_id, user_id)
         if not booking:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
-                detail=_error_response("Booking not found", "BOOKING_NOT_FOUND"),
+                detail=error_response("Booking not found", "BOOKING_NOT_FOUND"),
             )
         return booking
     except HTTPException:
@@ -142,44 +251,37 @@ def get_booking(booking_id: str, user_id: str):
         logger.exception("get_booking: failed to fetch booking")
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail=_error_response("Storage unavailable", "STORAGE_UNAVAILABLE"),
+            detail=error_response("Storage unavailable", "STORAGE_UNAVAILABLE"),
         )
 
 
+_UPDATABLE_FIELDS = (
+    "hotel_id",
+    "hotel_name",
+    "rooms",
+    "check_in_date",
+    "check_out_date",
+    "number_of_guests",
+    "primary_guest",
+    "special_requests",
+    "pricing",
+)
+
+
 @router.put("/bookings/{booking_id}")
 def update_booking(booking_id: str, payload: dict[str, Any]):
-    user_id = payload.get("user_id", "guest")
+    user_id = payload.get("user_id") or "guest"
     try:
-        bookings = _load_bookings()
-        booking = next(
-            (
-                item
-                for item in bookings
-                if item.get("booking_id") == booking_id and item.get("user_id") == user_id
-            ),
-            None,
-        )
-        if not booking:
+        # Only fields the caller sent are touched; everything else, pricing included, is kept as stored.
+        updated_fields = {field: payload[field] for field in _UPDATABLE_FIELDS if field in payload}
+        updated_fields["updated_at"] = current_timestamp()
+
+        updated_booking = _update_booking_record(booking_id, user_id, updated_fields)
+        if not updated_booking:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
-                detail=_error_response("Booking not found", "BOOKING_NOT_FOUND"),
+                detail=error_response("Booking not found", "BOOKING_NOT_FOUND"),
             )
-
-        updated_fields = {
-            "hotel_id": payload.get("hotel_id", booking.get("hotel_id")),
-            "hotel_name": payload.get("hotel_name", booking.get("hotel_name")),
-            "rooms": payload.get("rooms", booking.get("rooms")),
-            "check_in_date": payload.get("check_in_date", booking.get("check_in_date")),
-            "check_out_date": payload.get("check_out_date", booking.get("check_out_date")),
-            "number_of_guests": payload.get("number_of_guests", booking.get("number_of_guests")),
-            "primary_guest": payload.get("primary_guest", booking.get("primary_guest")),
-            "special_requests": payload.get("special_requests", booking.get("special_requests")),
-            "updated_at": _get_current_timestamp(),
-        }
-        updated_fields["pricing"] = payload["pricing"] if "pricing" in payload else booking.get("pricing")
-
-        updated_booking = _update_booking_record(bookings, booking_id, updated_fields)
-        _save_bookings(bookings)
         return {
             "message": "Booking updated successfully",
             "booking_details": updated_booking,
@@ -190,37 +292,26 @@ def update_booking(booking_id: str, payload: dict[str, Any]):
         logger.exception("update_booking: failed to update booking")
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail=_error_response("Booking update failed", "BOOKING_UPDATE_FAILED"),
+            detail=error_response("Booking update failed", "BOOKING_UPDATE_FAILED"),
         )
 
 
 @router.delete("/bookings/{booking_id}")
 def cancel_booking(booking_id: str, user_id: str):
     try:
-        bookings = _load_bookings()
-        booking = next(
-            (
-                item
-                for item in bookings
-                if item.get("booking_id") == booking_id and item.get("user_id") == user_id
-            ),
-            None,
-        )
-        if not booking:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=_error_response("Booking not found", "BOOKING_NOT_FOUND"),
-            )
-
         updated_booking = _update_booking_record(
-            bookings,
             booking_id,
+            user_id,
             {
                 "booking_status": "CANCELLED",
-                "cancelled_at": _get_current_timestamp(),
+                "cancelled_at": current_timestamp(),
             },
         )
-        _save_bookings(bookings)
+        if not updated_booking:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=error_response("Booking not found", "BOOKING_NOT_FOUND"),
+            )
         return {
             "message": "Booking cancelled successfully",
             "booking_details": updated_booking,
@@ -231,5 +322,5 @@ def cancel_booking(booking_id: str, user_id: str):
         logger.exception("cancel_booking: failed to cancel booking")
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail=_error_response("Booking cancel failed", "BOOKING_CANCEL_FAILED"),
+            detail=error_response("Booking cancel failed", "BOOKING_CANCEL_FAILED"),
         )
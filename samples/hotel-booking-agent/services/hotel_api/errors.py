@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+import time
+from datetime import datetime, timezone
+from typing import Any
+
+
+def current_timestamp() -> str:
+    return datetime.fromtimestamp(time.time(), timezone.utc).isoformat()
+
+
+def error_response(message: str, code: str) -> dict[str, Any]:
+    return {
+        "message": message,
+        "error_code": code,
+        "timestamp": current_timestamp(),
+    }
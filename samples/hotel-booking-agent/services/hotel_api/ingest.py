@@ -1,9 +1,13 @@
-import json
 import hashlib
+import threading
+from dataclasses import dataclass
 from pathlib import Path
 
 import logging
-from langchain_community.document_loaders import PyPDFLoader
+import orjson
+from langchain_community.document_loaders import PyPDFium2Loader
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_openai import OpenAIEmbeddings
 from langchain_pinecone import PineconeVectorStore
@@ -17,11 +21,54 @@ logger = logging.getLogger(__name__)
 
 DEFAULT_POLICIES_DIR = Path(__file__).resolve().parent / "resources" / "policy_pdfs"
 
+# Chunks from all folders are embedded together, this many texts per OpenAI request,
+# then upserted this many vectors per Pinecone request.
+EMBEDDING_BATCH_SIZE = 512
+UPSERT_BATCH_SIZE = 100
+# Ids per Pinecone fetch when checking which chunks are already in the index.
+FETCH_BATCH_SIZE = 100
+# Sidecar file recording, per policy folder, the content hash and vector ids last ingested.
+INGEST_STATE_FILENAME = ".ingest_state.json"
+
+
+class _DedupingEmbeddings(Embeddings):
+    """Embeds each distinct text once per ingest run; repeated boilerplate chunks reuse the vector."""
+
+    def __init__(self, inner: Embeddings) -> None:
+        self._inner = inner
+        # Per instance, so the vectors are released along with the PolicyIngestion that owns them.
+        self._cache: dict[bytes, list[float]] = {}
+        self._cache_lock = threading.Lock()
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        keys = [hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest() for text in texts]
+        with self._cache_lock:
+            missing = {key: text for key, text in zip(keys, texts) if key not in self._cache}
+        if missing:
+            vectors = self._inner.embed_documents(list(missing.values()))
+            with self._cache_lock:
+                self._cache.update(zip(missing.keys(), vectors))
+        with self._cache_lock:
+            return [self._cache[key] for key in keys]
+
+    def embed_query(self, text: str) -> list[float]:
+        return self._inner.embed_query(text)
+
+
+@dataclass
+class _PreparedFolder:
+    name: str
+    content_hash: str
+    chunks: list[Document]
+    ids: list[str]
+    # Vector ids from the previous ingest of this folder that the new chunks replace.
+    stale_ids: set[str]
+
 
 class PolicyIngestion:
     def __init__(self, settings: Settings) -> None:
         self._settings = settings
-        self._pdf_loader_cls = PyPDFLoader
+        self._pdf_loader_cls = PyPDFium2Loader
         self._splitter = RecursiveCharacterTextSplitter(
             chunk_size=1000,
             chunk_overlap=200,
@@ -30,29 +77,85 @@ class PolicyIngestion:
             model=self._settings.openai_embedding_model,
             api_key=self._settings.openai_api_key,
         )
-        self._vectorstore = PineconeVectorStore(
-            index_name=self._settings.pinecone_index_name,
-            embedding=embeddings,
-            pinecone_api_key=self._settings.pinecone_api_key,
+        self._index = Pinecone(api_key=self._settings.pinecone_api_key).Index(
+            name=self._settings.pinecone_index_name,
             host=self._settings.pinecone_service_url,
         )
+        self._vectorstore = PineconeVectorStore(
+            index=self._index,
+            embedding=_DedupingEmbeddings(embeddings),
+        )
 
-    def ingest_all_policies(self, policies_dir: Path) -> None:
-        policies_root = policies_dir
-        for hotel_dir in policies_root.iterdir():
-            if hotel_dir.is_dir():
-                self._ingest_policy_folder(hotel_dir)
+    def ingest_all_policies(self, policies_dir: Path, incremental: bool = False) -> None:
+        folders = [hotel_dir for hotel_dir in policies_dir.iterdir() if hotel_dir.is_dir()]
+        if not folders:
+            return
+        state_path = policies_dir / INGEST_STATE_FILENAME
+        state = _load_ingest_state(state_path) if incremental else {}
+
+        prepared = []
+        for folder in folders:
+            item = self._prepare_policy_folder(folder, state.get(folder.name) or {})
+            if item is not None:
+                prepared.append(item)
+        if not prepared:
+            return
+
+        # Chunk ids are content-derived, so an id already in the index needs no re-embedding.
+        all_ids = [chunk_id for item in prepared for chunk_id in item.ids]
+        existing_ids = self._existing_ids(all_ids)
+        pending = [
+            (chunk, chunk_id)
+            for item in prepared
+            for chunk, chunk_id in zip(item.chunks, item.ids)
+            if chunk_id not in existing_ids
+        ]
+        if existing_ids:
+            logger.info("Skipping %s chunks already present in the index", len(existing_ids))
+        chunks = [chunk for chunk, _ in pending]
+        ids = [chunk_id for _, chunk_id in pending]
+        for start in range(0, len(chunks), EMBEDDING_BATCH_SIZE):
+            end = start + EMBEDDING_BATCH_SIZE
+            self._vectorstore.add_documents(
+                chunks[start:end],
+                ids=ids[start:end],
+                batch_size=UPSERT_BATCH_SIZE,
+                embedding_chunk_size=EMBEDDING_BATCH_SIZE,
+            )
+        stale_ids = set().union(*(item.stale_ids for item in prepared))
+        if stale_ids:
+            self._vectorstore.delete(ids=sorted(stale_ids))
 
-    def _ingest_policy_folder(self, folder: Path) -> None:
+        for item in prepared:
+            state[item.name] = {"sha256": item.content_hash, "ids": item.ids}
+            logger.info("Ingested %s", item.name)
+        _save_ingest_state(state_path, state)
+
+    def _existing_ids(self, ids: list[str]) -> set[str]:
+        existing: set[str] = set()
+        for start in range(0, len(ids), FETCH_BATCH_SIZE):
+            response = self._index.fetch(ids=ids[start : start + FETCH_BATCH_SIZE])
+            existing.update(response.vectors)
+        return existing
+
+    def _prepare_policy_folder(self, folder: Path, previous: dict) -> _PreparedFolder | None:
         pdf_path = folder / "policies.pdf"
         metadata_path = folder / "metadata.json"
 
         if not pdf_path.exists() or not metadata_path.exists():
             logger.warning("Skipping %s: missing files", folder.name)
-            return
+            return None
+
+        metadata_bytes = metadata_path.read_bytes()
+        hasher = hashlib.sha256(pdf_path.read_bytes())
+        hasher.update(metadata_bytes)
+        content_hash = hasher.hexdigest()
+        if previous.get("sha256") == content_hash:
+            logger.info("Skipping %s: unchanged since last ingest", folder.name)
+            return None
 
         docs = self._pdf_loader_cls(str(pdf_path)).load()
-        metadata = json.loads(metadata_path.read_text())
+        metadata = orjson.loads(metadata_bytes)
         if not metadata.get("hotel_id") or not metadata.get("hotel_name"):
             raise ValueError(
                 f"Missing required hotel metadata in {metadata_path}. "
@@ -78,11 +181,36 @@ class PolicyIngestion:
                 "checksum": checksum,
             }
             ids.append(stable_id)
-        self._vectorstore.add_documents(chunks, ids=ids)
-        logger.info("Ingested %s", folder.name)
+        return _PreparedFolder(
+            name=folder.name,
+            content_hash=content_hash,
+            chunks=chunks,
+            ids=ids,
+            stale_ids=set(previous.get("ids") or []) - set(ids),
+        )
 
 
-def ensure_policy_index() -> None:
+def _load_ingest_state(state_path: Path) -> dict[str, dict]:
+    if not state_path.exists():
+        return {}
+    try:
+        return orjson.loads(state_path.read_bytes())
+    except (OSError, orjson.JSONDecodeError):
+        logger.warning("ingest state at %s is unreadable; re-ingesting all policies", state_path)
+        return {}
+
+
+def _save_ingest_state(state_path: Path, state: dict[str, dict]) -> None:
+    try:
+        state_path.write_bytes(
+            orjson.dumps(state, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS)
+        )
+    except OSError:
+        logger.warning("failed to write ingest state to %s", state_path)
+
+
+def ensure_policy_index() -> bool:
+    """Return False if the ingest failed; a deliberate skip counts as success."""
     try:
         settings = get_settings()
     except ValidationError as exc:
@@ -90,12 +218,13 @@ def ensure_policy_index() -> None:
             "policy ingest skipped; invalid Pinecone settings: %s",
             exc,
         )
-        return
+        return True
 
     if not settings.pinecone_api_key or not settings.pinecone_service_url or not settings.pinecone_index_name:
         logger.info("policy ingest skipped; missing Pinecone settings.")
-        return
+        return True
 
+    policies_dir = Path(settings.policies_dirs) if settings.policies_dirs else DEFAULT_POLICIES_DIR
     index_name = settings.pinecone_index_name
     try:
         pc = Pinecone(api_key=settings.pinecone_api_key)
@@ -105,31 +234,40 @@ def ensure_policy_index() -> None:
                 "policy ingest skipped; Pinecone index '%s' does not exist",
                 index_name,
             )
-            return
+            return False
         stats = pc.Index(index_name).describe_index_stats()
         total_vectors = getattr(stats, "total_vector_count", 0)
-        if total_vectors > 0:
+        incremental = total_vectors > 0
+        if incremental and not (policies_dir / INGEST_STATE_FILENAME).exists():
             logger.info(
                 "policy index '%s' already has %s vectors; skipping ingest",
                 index_name,
                 total_vectors,
             )
-            return
-        logger.info(
-            "policy index '%s' exists but is empty; proceeding with ingest",
-            index_name,
-        )
+            return True
+        if incremental:
+            logger.info(
+                "policy index '%s' already has %s vectors; ingesting changed policies only",
+                index_name,
+                total_vectors,
+            )
+        else:
+            logger.info(
+                "policy index '%s' exists but is empty; proceeding with ingest",
+                index_name,
+            )
     except Exception:
         logger.exception("failed to check Pinecone index; skipping policy ingest")
-        return
+        return False
 
-    policies_dir = Path(settings.policies_dirs) if settings.policies_dirs else DEFAULT_POLICIES_DIR
     try:
         ingestion = PolicyIngestion(settings)
-        ingestion.ingest_all_policies(policies_dir=policies_dir)
+        ingestion.ingest_all_policies(policies_dir=policies_dir, incremental=incremental)
         logger.info("policy ingest completed")
     except Exception:
         logger.exception("policy ingest failed")
+        return False
+    return True
 
 
 if __name__ == "__main__":
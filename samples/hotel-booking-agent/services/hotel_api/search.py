@@ -1,16 +1,23 @@
 from __future__ import annotations
 
-import json
+import hashlib
 import logging
-import re
+import mmap
+import string
 import threading
-from difflib import SequenceMatcher
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
 from math import ceil
 from pathlib import Path
 from typing import Any
 
-from fastapi import APIRouter, status
+import numpy as np
+import orjson
+from fastapi import APIRouter, Request, Response, status
 from fastapi.responses import JSONResponse
+from rapidfuzz import fuzz, process
 
 logger = logging.getLogger(__name__)
 
@@ -25,63 +32,244 @@ class HotelNotFoundError(HotelSearchError):
     pass
 
 
+@dataclass(frozen=True, eq=False)
+class _HotelRecord:
+    """A hotel from the dataset plus the fields the filters need, derived once at load time."""
+
+    hotel: dict[str, Any]
+    search_text: str
+    price: float
+    rating: float
+    amenities: tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class _HotelView:
+    """Records in one sort order, with their prices and ratings as parallel arrays."""
+
+    records: list[_HotelRecord]
+    prices: np.ndarray
+    ratings: np.ndarray
+
+
+def _build_view(records: list[_HotelRecord]) -> _HotelView:
+    return _HotelView(
+        records=records,
+        prices=np.fromiter((r.price for r in records), dtype=np.float64, count=len(records)),
+        ratings=np.fromiter((r.rating for r in records), dtype=np.float64, count=len(records)),
+    )
+
+
+@dataclass(frozen=True, eq=False)
+class _HotelDataset:
+    """The parsed dataset and its lookup indexes; replaced as a whole, never mutated."""
+
+    data: dict[str, Any]
+    # Content hash of the dataset file; changes whenever the data does.
+    version: str
+    # sort_by value -> records presorted in that order, so searches only need to filter.
+    # The None entry holds the records in dataset order.
+    views: dict[str | None, _HotelView]
+    # Trigram -> records whose search text contains it; used to narrow destination matches.
+    trigram_index: dict[str, set[_HotelRecord]]
+    # Normalized hotel name -> hotel id, for fuzzy name resolution.
+    hotel_ids_by_name: dict[str, str]
+    hotels_by_id: dict[str, dict[str, Any]]
+    rooms_by_hotel: dict[str, list[dict[str, Any]]]
+
+
 _dataset_lock = threading.Lock()
-_dataset_cache: dict[str, Any] | None = None
+_dataset_cache: _HotelDataset | None = None
 _dataset_path = Path(__file__).resolve().parent / "resources" / "hotel_data.json"
+# The dataset file is stat()ed at most this often to pick up changes without a restart.
+_DATASET_CHECK_INTERVAL_SECONDS = 5.0
+_dataset_mtime_ns: int | None = None
+_dataset_checked_at = 0.0
+
+_SEARCH_CACHE_MAX_SIZE = 512
+_SEARCH_CACHE_TTL_SECONDS = 300.0
+_search_cache_lock = threading.Lock()
+_search_cache: OrderedDict[tuple[Any, ...], tuple[float, list[dict[str, Any]]]] = OrderedDict()
+
+
+def _load_dataset() -> _HotelDataset:
+    global _dataset_cache, _dataset_mtime_ns, _dataset_checked_at
+    # Fast path without the lock: the snapshot is published with a single assignment.
+    dataset = _dataset_cache
+    if dataset is not None and time.monotonic() - _dataset_checked_at < _DATASET_CHECK_INTERVAL_SECONDS:
+        return dataset
+    with _dataset_lock:
+        now = time.monotonic()
+        if _dataset_cache is not None and now - _dataset_checked_at < _DATASET_CHECK_INTERVAL_SECONDS:
+            return _dataset_cache
+        _dataset_checked_at = now
+        try:
+            mtime_ns = _dataset_path.stat().st_mtime_ns
+            if _dataset_cache is None or mtime_ns != _dataset_mtime_ns:
+                _dataset_cache = _read_dataset()
+                _dataset_mtime_ns = mtime_ns
+                _clear_search_cache()
+        except (OSError, ValueError):
+            if _dataset_cache is None:
+                raise
+            logger.exception("failed to reload hotel dataset; serving the previously loaded copy")
+        return _dataset_cache
+
+
+def _read_dataset() -> _HotelDataset:
+    # Parse straight from the page cache instead of copying the file into a bytes object first.
+    with _dataset_path.open("rb") as dataset_file:
+        with mmap.mmap(dataset_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            with memoryview(mapped) as raw:
+                return _build_dataset(raw)
+
+
+def _build_dataset(raw: bytes | memoryview) -> _HotelDataset:
+    data = orjson.loads(raw)
+    hotels = data.get("hotels") or []
+    records = [_build_hotel_record(hotel) for hotel in hotels]
+    return _HotelDataset(
+        data=data,
+        version=hashlib.blake2b(raw, digest_size=16).hexdigest(),
+        views={
+            None: _build_view(records),
+            "price_low": _build_view(_sort_hotels_by_price(records, True)),
+            "price_high": _build_view(_sort_hotels_by_price(records, False)),
+            "rating": _build_view(_sort_hotels_by_rating(records)),
+        },
+        trigram_index=_build_trigram_index(records),
+        hotel_ids_by_name=_build_name_index(hotels),
+        hotels_by_id=_build_hotel_id_index(hotels),
+        rooms_by_hotel=_build_rooms_index(data.get("rooms") or []),
+    )
 
 
-def _load_dataset() -> dict[str, Any]:
-    global _dataset_cache
-    with _dataset_lock:
-        if _dataset_cache is None:
-            _dataset_cache = json.loads(_dataset_path.read_text())
-    return _dataset_cache or {}
+def _build_hotel_record(hotel: dict[str, Any]) -> _HotelRecord:
+    search_text = " ".join(
+        str(value)
+        for value in (
+            hotel.get("city"),
+            hotel.get("hotel_name"),
+            hotel.get("name"),
+            hotel.get("place_name"),
+            hotel.get("short_place_name"),
+        )
+        if value
+    ).lower()
+    return _HotelRecord(
+        hotel=hotel,
+        search_text=search_text,
+        price=float(hotel.get("lowest_price") or 0),
+        rating=float(hotel.get("rating") or 0),
+        amenities=tuple(str(amenity).lower() for amenity in hotel.get("amenities") or ()),
+    )
+
+
+def _clear_search_cache() -> None:
+    with _search_cache_lock:
+        _search_cache.clear()
+    _resolve_hotel_id.cache_clear()
+
+
+# Deletes every ASCII character except [a-z0-9]; non-ASCII is dropped before translating.
+_NON_ALNUM_DELETE_TABLE = str.maketrans(
+    "",
+    "",
+    "".join(chr(c) for c in range(128) if chr(c) not in string.ascii_lowercase + string.digits),
+)
 
 
 def _normalize_name(value: str) -> str:
-    return re.sub(r"[^a-z0-9]+", "", value.lower())
+    return value.lower().encode("ascii", "ignore").decode("ascii").translate(_NON_ALNUM_DELETE_TABLE)
+
+
+def _build_name_index(hotels: list[dict[str, Any]]) -> dict[str, str]:
+    index: dict[str, str] = {}
+    for hotel in hotels:
+        candidate = _normalize_name(str(hotel.get("hotel_name") or hotel.get("name") or ""))
+        if candidate and hotel.get("hotel_id"):
+            index.setdefault(candidate, str(hotel.get("hotel_id")))
+    return index
 
 
 def resolve_hotel_id_by_name(name: str, threshold: float = 0.75) -> str | None:
-    data = _load_dataset()
-    hotels = data.get("hotels") or []
+    return _resolve_hotel_id(_load_dataset(), name, threshold)
+
+
+@lru_cache(maxsize=512)
+def _resolve_hotel_id(dataset: _HotelDataset, name: str, threshold: float) -> str | None:
+    hotel_ids_by_name = dataset.hotel_ids_by_name
     target = _normalize_name(name)
     if not target:
         return None
-    best_id = None
-    best_score = 0.0
+    match = process.extractOne(
+        target,
+        hotel_ids_by_name.keys(),
+        scorer=fuzz.ratio,
+        score_cutoff=threshold * 100,
+    )
+    if match is None:
+        return None
+    return hotel_ids_by_name[match[0]]
+
+
+def _build_hotel_id_index(hotels: list[dict[str, Any]]) -> dict[str, dict[str, Any]]:
+    index: dict[str, dict[str, Any]] = {}
     for hotel in hotels:
-        hotel_name = str(hotel.get("hotel_name") or hotel.get("name") or "")
-        candidate = _normalize_name(hotel_name)
-        if not candidate:
-            continue
-        score = SequenceMatcher(None, target, candidate).ratio()
-        if score > best_score:
-            best_score = score
-            best_id = hotel.get("hotel_id")
-    if best_id and best_score >= threshold:
-        return str(best_id)
-    return None
+        index.setdefault(hotel.get("hotel_id"), hotel)
+    return index
+
+
+def _build_rooms_index(rooms: list[dict[str, Any]]) -> dict[str, list[dict[str, Any]]]:
+    index: dict[str, list[dict[str, Any]]] = {}
+    for room in rooms:
+        index.setdefault(room.get("hotel_id"), []).append(room)
+    return index
 
 
 def _rooms_for_hotel(hotel_id: str) -> list[dict[str, Any]]:
-    data = _load_dataset()
-    rooms = data.get("rooms") or []
-    return [room for room in rooms if room.get("hotel_id") == hotel_id]
+    return list(_load_dataset().rooms_by_hotel.get(hotel_id, ()))
+
+
+def _trigrams(text: str) -> set[str]:
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+def _build_trigram_index(records: list[_HotelRecord]) -> dict[str, set[_HotelRecord]]:
+    index: dict[str, set[_HotelRecord]] = {}
+    for record in records:
+        for gram in _trigrams(record.search_text):
+            index.setdefault(gram, set()).add(record)
+    return index
+
 
+def _destination_candidates(
+    trigram_index: dict[str, set[_HotelRecord]],
+    tokens: list[str],
+) -> set[_HotelRecord] | None:
+    """Return records that may contain any token, or None when a token is too short to index."""
+    candidates: set[_HotelRecord] = set()
+    for token in tokens:
+        grams = _trigrams(token)
+        if not grams:
+            return None
+        postings = sorted((trigram_index.get(gram, set()) for gram in grams), key=len)
+        candidates |= postings[0].intersection(*postings[1:])
+    return candidates
 
-def _sort_hotels_by_price(items: list[dict[str, Any]], ascending: bool) -> list[dict[str, Any]]:
+
+def _sort_hotels_by_price(items: list[_HotelRecord], ascending: bool) -> list[_HotelRecord]:
     return sorted(
         items,
-        key=lambda hotel: hotel.get("lowest_price", 0),
+        key=lambda record: record.price,
         reverse=not ascending,
     )
 
 
-def _sort_hotels_by_rating(items: list[dict[str, Any]]) -> list[dict[str, Any]]:
+def _sort_hotels_by_rating(items: list[_HotelRecord]) -> list[_HotelRecord]:
     return sorted(
         items,
-        key=lambda hotel: hotel.get("rating", 0),
+        key=lambda record: record.rating,
         reverse=True,
     )
 
@@ -97,72 +285,86 @@ def _paginate(items: list[dict[str, Any]], page: int, page_size: int) -> list[di
 
 
 def _apply_filters(
-    items: list[dict[str, Any]],
+    dataset: _HotelDataset,
+    view: _HotelView,
     destination: str | None,
     min_price: float | None,
     max_price: float | None,
     min_rating: float | None,
     amenities: list[str] | None,
-    sort_by: str | None,
 ) -> list[dict[str, Any]]:
-    filtered = items[:]
-
+    """Filter ``view`` without reordering it; callers pass a presorted view to get sorted results."""
+    filtered = view.records
+
+    # Numeric filters run first as one vectorized mask; a price or rating of 0 means unknown.
+    if min_price is not None or max_price is not None or min_rating is not None:
+        mask = np.ones(len(filtered), dtype=bool)
+        if min_price is not None:
+            mask &= (view.prices == 0) | (view.prices >= min_price)
+        if max_price is not None:
+            mask &= (view.prices == 0) | (view.prices <= max_price)
+        if min_rating is not None:
+            mask &= (view.ratings == 0) | (view.ratings >= min_rating)
+        filtered = [filtered[i] for i in np.flatnonzero(mask)]
+
+    tokens = None
+    candidates = None
     if destination:
         tokens = [t.strip().lower() for t in destination.split(",") if t.strip()]
-
-        def _searchable_text(hotel: dict[str, Any]) -> str:
-            return " ".join(
-                str(value)
-                for value in (
-                    hotel.get("city"),
-                    hotel.get("hotel_name"),
-                    hotel.get("name"),
-                    hotel.get("place_name"),
-                    hotel.get("short_place_name"),
-                )
-                if value
-            ).lower()
-
-        filtered = [h for h in filtered if any(token in _searchable_text(h) for token in tokens)]
-
-    if min_price is not None or max_price is not None:
-        tmp = []
-        for h in filtered:
-            price = h.get("lowest_price", 0)
-            if price == 0:
-                tmp.append(h)
+        candidates = _destination_candidates(dataset.trigram_index, tokens)
+    requested = [a.lower() for a in amenities] if amenities else None
+    if tokens is None and requested is None:
+        return [r.hotel for r in filtered]
+
+    # Remaining predicates are checked in a single pass, cheapest first.
+    results = []
+    for r in filtered:
+        if tokens is not None:
+            if candidates is not None and r not in candidates:
                 continue
-            if min_price is not None and price < min_price:
+            if not any(token in r.search_text for token in tokens):
                 continue
-            if max_price is not None and price > max_price:
-                continue
-            tmp.append(h)
-        filtered = tmp
-
-    if min_rating is not None:
-        filtered = [
-            h
-            for h in filtered
-            if h.get("rating", 0) == 0 or h.get("rating", 0) >= min_rating
-        ]
-
-    if amenities:
-        filtered = [
-            h
-            for h in filtered
-            if all(
-                any(a.lower() in str(ha).lower() for ha in h.get("amenities", []))
-                for a in amenities
-            )
-        ]
-
-    if sort_by == "price_low":
-        filtered = _sort_hotels_by_price(filtered, True)
-    elif sort_by == "price_high":
-        filtered = _sort_hotels_by_price(filtered, False)
-    elif sort_by == "rating":
-        filtered = _sort_hotels_by_rating(filtered)
+        if requested is not None and not all(
+            any(a in ha for ha in r.amenities) for a in requested
+        ):
+            continue
+        results.append(r.hotel)
+    return results
 
+
+def _cached_filter(
+    dataset: _HotelDataset,
+    destination: str | None,
+    min_price: float | None,
+    max_price: float | None,
+    min_rating: float | None,
+    amenities: list[str] | None,
+    sort_by: str | None,
+) -> list[dict[str, Any]]:
+    # Pagination is applied after this step, so every page of a query shares one entry.
+    key = (
+        dataset.version,
+        destination,
+        min_price,
+        max_price,
+        min_rating,
+        tuple(amenities) if amenities else None,
+        sort_by,
+    )
+    now = time.monotonic()
+    with _search_cache_lock:
+        entry = _search_cache.get(key)
+        if entry is not None and now - entry[0] < _SEARCH_CACHE_TTL_SECONDS:
+            _search_cache.move_to_end(key)
+            return entry[1]
+
+    view = dataset.views.get(sort_by, dataset.views[None])
+    filtered = _apply_filters(dataset, view, destination, min_price, max_price, min_rating, amenities)
+    with _search_cache_lock:
+        _search_cache[key] = (now, filtered)
+        _search_cache.move_to_end(key)
+        while len(_search_cache) > _SEARCH_CACHE_MAX_SIZE:
+            _search_cache.popitem(last=False)
     return filtered
 
 
@@ -201,9 +403,8 @@ def search_hotels(
             },
         }
 
-    data = _load_dataset()
-    hotels = data.get("hotels") or []
-    filtered = _apply_filters(hotels, destination, min_price, max_price, min_rating, amenities, sort_by)
+    dataset = _load_dataset()
+    filtered = _cached_filter(dataset, destination, min_price, max_price, min_rating, amenities, sort_by)
     paginated = _paginate(filtered, page, page_size)
 
     return {
@@ -223,11 +424,7 @@ def get_hotel_details(
     check_out_date: str | None = None,
     guests: int = 2,
 ) -> dict[str, Any]:
-    data = _load_dataset()
-    match = next(
-        (item for item in data.get("hotels", []) if item.get("hotel_id") == hotel_id),
-        None,
-    )
+    match = _load_dataset().hotels_by_id.get(hotel_id)
     if not match:
         raise HotelNotFoundError("Hotel not found.")
     hotel = dict(match)
@@ -280,11 +477,7 @@ def check_availability(
     guests: int = 2,
     room_count: int = 1,
 ) -> dict[str, Any]:
-    data = _load_dataset()
-    match = next(
-        (item for item in data.get("hotels", []) if item.get("hotel_id") == hotel_id),
-        None,
-    )
+    match = _load_dataset().hotels_by_id.get(hotel_id)
     if not match:
         raise HotelNotFoundError("Hotel not found.")
     hotel_name = str(match.get("hotel_name") or match.get("name") or "")
@@ -305,8 +498,21 @@ def _error_response(message: str, code: str) -> dict[str, Any]:
     }
 
 
+def _search_etag(version: str, params: tuple[Any, ...]) -> str:
+    digest = hashlib.blake2b(orjson.dumps([version, *params]), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    return any(tag.strip() in (etag, f"W/{etag}", "*") for tag in if_none_match.split(","))
+
+
 @router.get("/hotels/search")
 def search_hotels_route(
+    request: Request,
+    response: Response,
     destination: str | None = None,
     check_in_date: str | None = None,
     check_out_date: str | None = None,
@@ -321,6 +527,28 @@ def search_hotels_route(
     page_size: int = 10,
 ):
     try:
+        # Results depend only on the dataset and the query, so the ETag is known before searching.
+        etag = _search_etag(
+            _load_dataset().version,
+            (
+                destination,
+                check_in_date,
+                check_out_date,
+                guests,
+                rooms,
+                min_price,
+                max_price,
+                min_rating,
+                amenities,
+                sort_by,
+                page,
+                page_size,
+            ),
+        )
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+
         amenities_list = (
             [item.strip() for item in amenities.split(",") if item.strip()]
             if amenities
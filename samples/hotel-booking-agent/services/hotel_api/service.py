@@ -1,12 +1,49 @@
 from __future__ import annotations
 
-from fastapi import FastAPI
+import logging
+import threading
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 
+from fastapi import FastAPI, HTTPException, status
+from fastapi.responses import ORJSONResponse
+
+from batch import router as batch_router
 from booking import router as booking_router
 from ingest import ensure_policy_index
 from search import router as search_router
 
-app = FastAPI(title="Hotel Booking API")
+logger = logging.getLogger(__name__)
+
+# Set once the background policy ingest has succeeded or was deliberately skipped; a failed ingest leaves it unset.
+_policy_ready = threading.Event()
+_policy_failed = threading.Event()
+
+
+def _run_policy_ingest() -> None:
+    try:
+        ok = ensure_policy_index()
+    except Exception:
+        logger.exception("policy ingest failed")
+        ok = False
+    if ok:
+        _policy_ready.set()
+    else:
+        _policy_failed.set()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # A daemon thread rather than the loop's default executor, which shutdown would wait on.
+    threading.Thread(target=_run_policy_ingest, name="policy-ingest", daemon=True).start()
+    yield
+
+
+app = FastAPI(
+    title="Hotel Booking API",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
+)
 
 
 @app.get("/health")
@@ -14,10 +51,22 @@ def health():
     return {"status": "ok"}
 
 
+@app.get("/health/ready")
+def health_ready():
+    if _policy_failed.is_set():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Policy ingest failed; see the service logs",
+        )
+    if not _policy_ready.is_set():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Policy index is still being prepared",
+        )
+    return {"status": "ready"}
+
+
 app.include_router(booking_router)
 app.include_router(search_router)
+app.include_router(batch_router)
 
-
-@app.on_event("startup")
-def bootstrap_policy_index() -> None:
-    ensure_policy_index()